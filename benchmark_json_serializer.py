@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare size and speed of the json_serializer formats on the pipeline files.
+
+Input: the outputs of step 1 and step 2. If the step 2 file has not been generated, a synthetic
+    sample with the same structure is built from the step 1 metadata.
+Output: table with size, write time and read time for each format
+"""
+import argparse
+import json
+import os
+import tempfile
+import timeit
+import json_serializer
+
+
+def stdlib_load(infile):
+    with open(infile, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# The stdlib formats are read back with the stdlib decoder, "fast" with orjson if installed
+readers = {
+    "pretty": stdlib_load,
+    "compact": stdlib_load,
+    "fast": json_serializer.load,
+}
+
+
+def synthetic_wikiformat_data(metadata):
+    """
+    Build a stand-in for `SMVK-Cypern_2017-02_wikiformat_data.json` from the step 1 metadata.
+
+    The records have the keys and roughly the size of the output of create_infotexts.main(), without
+    needing the Commons mappings or batchupload.
+    """
+    batch_info = {}
+    for fotonr, item in metadata.items():
+        info = "{{Photograph \n"
+        info += "| photographer       =  {{Creator:John Lindros}}\n"
+        info += "| description        = {{sv| " + item["Beskrivning"] + " Svenska Cypernexpeditionen 1927–1931. "
+        if item["Nyckelord"]:
+            info += "<br>''Nyckelord:'' " + item["Nyckelord"]
+        info += "}}\n{{en|The Swedish Cyprus expedition 1927–1931}}\n"
+        info += "| depicted people    = " + item["Personnamn / avbildad"] + "\n"
+        info += "| depicted place     = " + item["Ort, foto"] + "\n"
+        info += "| date               = {{Between|1927|1931}}\n"
+        info += "| institution        = {{Institution:Statens museer för världskultur}}\n"
+        info += "| department         = [[:d:Q1331646|Medelhavsmuseet]]\n"
+        info += "| accession number   = " + item["smvk_link"] + "\n"
+        info += "| source             = The original image file was recieved from SMVK with the following filename:"
+        info += "<br />'''" + fotonr + ".tif'''\n{{SMVK cooperation project|COH}}\n"
+        info += "| permission         = {{cc-zero}}\n"
+        info += "}}\n"
+
+        batch_info[fotonr] = {
+            "filename": os.path.splitext(item["commons_fname"])[0],
+            "info": info,
+            "cats": [kw for kw in item["Nyckelord"].split(", ") if kw],
+            "meta_cats": ["Swedish Cyprus Expedition", "Media_contributed_by_SMVK_2017-02"],
+        }
+
+    return batch_info
+
+
+def benchmark_data(name, data, repeat):
+    """Serialize data in every format and print the results."""
+    print("{} ({} records)".format(name, len(data)))
+    print("  {:<8} {:>10} {:>7} {:>10} {:>10}".format("format", "bytes", "size", "write ms", "read ms"))
+
+    baseline = None
+    for json_format in json_serializer.JSON_FORMATS:
+        fd, tmp_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            write_time = min(timeit.repeat(lambda: json_serializer.save(data, tmp_path, json_format),
+                                           number=1, repeat=repeat))
+            read_time = min(timeit.repeat(lambda: readers[json_format](tmp_path),
+                                          number=1, repeat=repeat))
+            size = os.path.getsize(tmp_path)
+        finally:
+            os.remove(tmp_path)
+
+        if baseline is None:
+            baseline = size
+        print("  {:<8} {:>10} {:>6.0%} {:>10.1f} {:>10.1f}".format(
+            json_format, size, size / baseline, write_time * 1000, read_time * 1000))
+
+    if json_serializer.orjson is None:
+        print("  (orjson not installed, 'fast' fell back to 'compact')")
+
+
+def main(args):
+    metadata = json_serializer.load(args.metadata)
+    benchmark_data(args.metadata, metadata, args.repeat)
+
+    if os.path.exists(args.wikiformat):
+        benchmark_data(args.wikiformat, json_serializer.load(args.wikiformat), args.repeat)
+    else:
+        benchmark_data("{} (synthetic, file not found)".format(args.wikiformat),
+                       synthetic_wikiformat_data(metadata), args.repeat)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--metadata", default="SMVK-Cypern_2017-01_metadata.json")
+    parser.add_argument("--wikiformat", default="SMVK-Cypern_2017-02_wikiformat_data.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(arguments)
@@ -8,11 +8,15 @@ JSON-file ´SMVK-Cypern_2017-01_metadata.json´ and add new filenames, SMVK-MM-l
 Outputs <Fotonummer>.info files in a subdirectory ./infofiles/
 """
 
+import argparse
+import fnmatch
 import json
+import os
 import re
 import pandas as pd
 import batchupload.helpers as helpers
 import numpy as np
+import json_serializer
 
 people_mapping_file = open("./people_mappings.json")
 people_mapping = json.loads(people_mapping_file.read())
@@ -74,13 +78,124 @@ def load_json_metadata(infile):
     :infile: created with ´metadata_to_json_and_fnamesmap.py´
     :returns: dictionary with <Fotonummer> as keys e.g. `C03643` for image file `C03643.tif´
     """
-    metadata = json.load(open(infile))
+    metadata = json_serializer.load(infile)
 
     # print("metadata item C01427: {}".format(metadata["C01427"]))
 
     return metadata
 
 
+def has_faulty_depicted_people(item):
+    """Check if <Personnamn / avbildad> can not be split into names, see CypernImage.process_depicted_people."""
+    try:
+        CypernImage.isolate_name(item["Personnamn / avbildad"])
+    except ValueError:
+        return True
+    return False
+
+
+def has_poor_description(item):
+    """Check if <Beskrivning> is missing, see generate_infobox_template."""
+    return not item["Beskrivning"]
+
+
+# Filters selectable with --filter, evaluated on the selected records only when they are loaded
+record_filters = {
+    "faulty_depicted_people": has_faulty_depicted_people,
+    "poor_description": has_poor_description,
+    "no_place": lambda item: not item["Ort, foto"],
+}
+
+
+def build_metadata_index(infile):
+    """
+    Stream the metadata json blob and index the position of every record in the file.
+
+    :infile: created with ´metadata_to_json_and_fnamesmap.py´
+    :returns: dictionary with <Fotonummer> as keys and [offset, length] in bytes as values
+    """
+    records = {}
+    for fotonr, _, offset, length in json_serializer.iter_record_spans(infile):
+        records[fotonr] = [offset, length]
+
+    return records
+
+
+def load_metadata_index(infile):
+    """
+    Load the index for the metadata json blob, rebuilding it if the blob changed.
+
+    The index is cached next to the blob as `<infile>.index`.
+
+    :infile: created with ´metadata_to_json_and_fnamesmap.py´
+    :returns: dictionary as returned by build_metadata_index
+    """
+    index_file = infile + ".index"
+    stat = os.stat(infile)
+    source = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    if os.path.exists(index_file):
+        index = json_serializer.load(index_file)
+        if index["source"] == source:
+            return index["records"]
+
+    records = build_metadata_index(infile)
+    json_serializer.save({"source": source, "records": records}, index_file, "compact")
+    print("Successfully wrote file {}".format(index_file))
+
+    return records
+
+
+def select_fotonummer(index, only=None):
+    """
+    Select records from the metadata index by <Fotonummer>, in file order.
+
+    :param index: dictionary as returned by load_metadata_index
+    :param only: list of <Fotonummer> or glob patterns e.g. `C014*`, None selects all records
+    :return: list of <Fotonummer>
+    """
+    selected = list(index)
+
+    if only:
+        for pattern in only:
+            if not any(fnmatch.fnmatchcase(fotonr, pattern) for fotonr in selected):
+                print("No record matches --only {}".format(pattern))
+        selected = [fotonr for fotonr in selected
+                    if any(fnmatch.fnmatchcase(fotonr, pattern) for pattern in only)]
+
+    return selected
+
+
+def load_selected_metadata(infile, only=None, filters=None, limit=None):
+    """
+    Load only the selected records from the metadata json blob, using the index.
+
+    Records are selected by `only` through the index, loaded by their position in the file and then
+    kept if they match all `filters`, until `limit` records have been found.
+
+    :infile: created with ´metadata_to_json_and_fnamesmap.py´
+    :param only: list of <Fotonummer> or glob patterns, see select_fotonummer
+    :param filters: list of keys in record_filters that a record must all match
+    :param limit: maximum number of records to load
+    :returns: dictionary with <Fotonummer> as keys, like load_json_metadata
+    """
+    index = load_metadata_index(infile)
+    selected = select_fotonummer(index, only)
+
+    metadata = {}
+    if limit != 0:
+        spans = [(fotonr, index[fotonr][0], index[fotonr][1]) for fotonr in selected]
+        for fotonr, item in json_serializer.load_records(infile, spans):
+            if all(record_filters[name](item) for name in filters or []):
+                metadata[fotonr] = item
+                if len(metadata) == limit:
+                    break
+
+    print("Selected {} of {} records".format(len(metadata), len(index)))
+
+    return metadata
+
+
 def create_people_mapping_wikitable(people_mapping):
     """
     Transform dictionary containing people mapping to wikitable.
@@ -143,7 +258,7 @@ def generate_infobox_template(item, img, places_mapping):
 
     infobox += "| description        = {{sv| "
 
-    if item["Beskrivning"]:
+    if not has_poor_description(item):
         infobox += img.data["enriched_description"]
     else:
         infobox += "Svenska Cypernexpeditionen 1927–1931"  # Generates six cases only
@@ -200,13 +315,32 @@ def generate_infobox_template(item, img, places_mapping):
     return infobox
 
 
-def main():
+def non_negative_int(value):
+    """Argparse type for --limit."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("must be 0 or larger, got {}".format(value))
+    return number
+
+
+def main(args):
     """Creation of the infoxtext, i.e. wikitext, that goes along with an uploaded image to Commons.
     
-    :metadata_json: created with script `metadata_to_json_and_fnamesmap.py
+    :args.metadata: created with script `metadata_to_json_and_fnamesmap.py
+    :args.json_format: one of json_serializer.JSON_FORMATS, "pretty" for human readable output
+    :args.only, args.filter, args.limit: process only a subset of the records, see load_selected_metadata
+    :args.json_out: defaults to a separate subset file when only a subset is processed, so that the
+        full batch output is not overwritten
     """
-    metadata_json = "SMVK-Cypern_2017-01_metadata.json"
-    outfile = open("./SMVK-Cypern_2017-02_wikiformat_data.json", "w")
+    metadata_json = args.metadata
+    subset = args.only or args.filter or args.limit is not None
+
+    wikiformat_json = args.json_out
+    if wikiformat_json is None:
+        if subset:
+            wikiformat_json = "./SMVK-Cypern_2017-02_wikiformat_data_subset.json"
+        else:
+            wikiformat_json = "./SMVK-Cypern_2017-02_wikiformat_data.json"
 
     # Hack to printout a wikitable to copy-paste to WikiCommons
     # people = create_people_mapping_wikitable(people_mapping)
@@ -215,7 +349,11 @@ def main():
     keywords_mapping = load_keywords_mapping()
     # print(places_mapping)
 
-    metadata = load_json_metadata(metadata_json)
+    if subset:
+        metadata = load_selected_metadata(metadata_json, args.only, args.filter, args.limit)
+    else:
+        metadata = load_json_metadata(metadata_json)
+
     batch_info = {}
     for fotonr in metadata:
         desc = metadata[fotonr]["Beskrivning"]
@@ -244,8 +382,8 @@ def main():
         batch_info[fotonr] = img_info
 
 
-    outfile.write(json.dumps(batch_info, ensure_ascii=False, indent=4))
-    outfile.close()
+    json_serializer.save(batch_info, wikiformat_json, args.json_format)
+    print("Successfully wrote file {}".format(wikiformat_json))
 
 
 class CypernImage:
@@ -577,4 +715,17 @@ class CypernImage:
             self.meta_cats.append("Media_contributed_by_SMVK_needing additional_categorization")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--metadata", default="SMVK-Cypern_2017-01_metadata.json")
+    parser.add_argument("--json_out", default=None,
+                        help="defaults to ./SMVK-Cypern_2017-02_wikiformat_data.json, or "
+                             "./SMVK-Cypern_2017-02_wikiformat_data_subset.json with --only, --filter or --limit")
+    parser.add_argument("--json_format", choices=json_serializer.JSON_FORMATS,
+                        default=json_serializer.DEFAULT_JSON_FORMAT)
+    parser.add_argument("--only", nargs="+", metavar="FOTONUMMER",
+                        help="process only these <Fotonummer>, glob patterns like 'C014*' are allowed")
+    parser.add_argument("--filter", nargs="+", choices=sorted(record_filters),
+                        help="process only records matching all of these filters")
+    parser.add_argument("--limit", type=non_negative_int, default=None)
+    arguments = parser.parse_args()
+    main(arguments)
@@ -0,0 +1,160 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Diff regenerated infotexts against the output of a previous run.
+
+Input: two versions of `SMVK-Cypern_2017-02_wikiformat_data.json`
+Processing: compare per-record digests of the fields `filename`, `info`, `cats` and `meta_cats`,
+    and compute field-level diffs only for records whose digest changed.
+Output: change report printed to stdout and, optionally, saved as JSON-file.
+
+Both files are streamed. Only a digest and the byte position of every old record are held in memory,
+changed records are read back from the old file one at a time by their position.
+"""
+import argparse
+import difflib
+import hashlib
+import json
+import json_serializer
+
+DIFF_FIELDS = ["filename", "info", "cats", "meta_cats"]
+CATEGORY_FIELDS = ["cats", "meta_cats"]
+
+
+def normalize_record(record):
+    """
+    Pick the compared fields from one record.
+
+    The category lists are built from sets in create_infotexts.py, so their order is not stable
+    between runs and they are sorted before comparison.
+
+    :param record: dictionary for one image in the wikiformat data
+    :return: dictionary with the fields in DIFF_FIELDS
+    """
+    normalized = {}
+    for field in DIFF_FIELDS:
+        value = record.get(field)
+        if field in CATEGORY_FIELDS and value is not None:
+            value = sorted(value)
+        normalized[field] = value
+    return normalized
+
+
+def record_digest(record):
+    """Return a digest of the compared fields of one record."""
+    canonical = json.dumps(normalize_record(record), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def diff_field(field, old_value, new_value):
+    """
+    Compute the change of a single field.
+
+    :return: None if unchanged, otherwise a compact description of the change
+    """
+    if old_value == new_value:
+        return None
+
+    if field in CATEGORY_FIELDS:
+        old_set = set(old_value or [])
+        new_set = set(new_value or [])
+        return {"added": sorted(new_set - old_set), "removed": sorted(old_set - new_set)}
+
+    if field == "info" and old_value is not None and new_value is not None:
+        diff = difflib.unified_diff(old_value.splitlines(), new_value.splitlines(), lineterm="", n=0)
+        # Skip the '---'/'+++' file headers, the record is identified by its key
+        return [line for line in diff if not line.startswith(("---", "+++"))]
+
+    return {"old": old_value, "new": new_value}
+
+
+def diff_record(old_record, new_record):
+    """Return field-level diffs for one record whose digest changed."""
+    old_record = normalize_record(old_record)
+    new_record = normalize_record(new_record)
+
+    changes = {}
+    for field in DIFF_FIELDS:
+        change = diff_field(field, old_record[field], new_record[field])
+        if change is not None:
+            changes[field] = change
+    return changes
+
+
+def diff_infotexts(old_file, new_file):
+    """
+    Compare two wikiformat data files.
+
+    :param old_file: path to the output of the previous run
+    :param new_file: path to the regenerated output
+    :return: dictionary with the keys `added`, `removed` and `changed`
+    """
+    old_spans = {}
+    for fotonr, record, offset, length in json_serializer.iter_record_spans(old_file):
+        old_spans[fotonr] = (record_digest(record), offset, length)
+
+    added = []
+    changed = {}
+    seen = set()
+    with open(old_file, "rb") as old_f:
+        for fotonr, record in json_serializer.iter_records(new_file):
+            seen.add(fotonr)
+            if fotonr not in old_spans:
+                added.append(fotonr)
+                continue
+
+            digest, offset, length = old_spans[fotonr]
+            if digest != record_digest(record):
+                old_record = json_serializer.read_record(old_f, offset, length)
+                changed[fotonr] = diff_record(old_record, record)
+
+    removed = [fotonr for fotonr in old_spans if fotonr not in seen]
+
+    return {"added": sorted(added), "removed": sorted(removed),
+            "changed": dict(sorted(changed.items()))}
+
+
+def print_report(report):
+    """Print a compact, human readable version of the change report."""
+    print("added: {}, removed: {}, changed: {}".format(
+        len(report["added"]), len(report["removed"]), len(report["changed"])))
+
+    for fotonr in report["added"]:
+        print("+ {}".format(fotonr))
+    for fotonr in report["removed"]:
+        print("- {}".format(fotonr))
+
+    for fotonr, changes in report["changed"].items():
+        print("~ {} ({})".format(fotonr, ", ".join(changes)))
+        for field, change in changes.items():
+            if field in CATEGORY_FIELDS:
+                for cat in change["added"]:
+                    print("    {} + {}".format(field, cat))
+                for cat in change["removed"]:
+                    print("    {} - {}".format(field, cat))
+            elif field == "info":
+                for line in change:
+                    print("    info {}".format(line))
+            else:
+                print("    {}: {} -> {}".format(field, change["old"], change["new"]))
+
+
+def main(args):
+    """Diff the two files and output the change report."""
+    report = diff_infotexts(args.old, args.new)
+    print_report(report)
+
+    if args.report_out:
+        json_serializer.save(report, args.report_out, args.json_format)
+        print("Successfully wrote file {}".format(args.report_out))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old", help="wikiformat data from the previous run")
+    parser.add_argument("new", nargs="?", default="SMVK-Cypern_2017-02_wikiformat_data.json")
+    parser.add_argument("--report_out", default=None)
+    parser.add_argument("--json_format", choices=json_serializer.JSON_FORMATS,
+                        default=json_serializer.DEFAULT_JSON_FORMAT)
+    arguments = parser.parse_args()
+    main(arguments)
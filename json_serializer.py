@@ -0,0 +1,224 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Serialize the intermediate JSON-files of the SMVK-Cypern_2017-01 batch.
+
+Three output modes are available:
+  "pretty"  - stdlib encoder with indent=4, for files humans read
+  "compact" - stdlib encoder without indentation or extra whitespace
+  "fast"    - orjson if installed, otherwise falls back to "compact"
+
+All modes write UTF-8 without escaping non-ascii characters and turn
+datetime objects into ISO 8601 strings. "fast" and "compact" give the same
+output, except that orjson writes NaN and Infinity as null where the stdlib
+encoder writes the (non-standard) tokens NaN and Infinity.
+"""
+import datetime
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_FORMATS = ["pretty", "compact", "fast"]
+DEFAULT_JSON_FORMAT = "fast"
+
+
+def datetime_default(obj):
+    """Turn datetime objects into ISO 8601 strings for the stdlib encoder."""
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+def dumps(data, json_format=DEFAULT_JSON_FORMAT):
+    """
+    Serialize data to a JSON string using the given format.
+
+    :param data: json serializable object, may contain datetime objects
+    :param json_format: one of JSON_FORMATS
+    :return: string
+    """
+    if json_format not in JSON_FORMATS:
+        raise ValueError("Unknown json format: {}".format(json_format))
+
+    if json_format == "fast" and orjson is not None:
+        # orjson handles datetime natively and always outputs UTF-8 bytes
+        try:
+            return orjson.dumps(data, default=datetime_default,
+                                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers over 64 bits, let the stdlib encoder serialize or fail the same way as "compact"
+            pass
+
+    if json_format == "pretty":
+        return json.dumps(data, ensure_ascii=False, indent=4, default=datetime_default)
+
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=datetime_default)
+
+
+def save(data, json_out, json_format=DEFAULT_JSON_FORMAT):
+    """
+    Save data as JSON to file.
+
+    :param data: json serializable object
+    :param json_out: path to output file
+    :param json_format: one of JSON_FORMATS
+    """
+    with open(json_out, "w", encoding="utf-8", newline="") as outfile:
+        outfile.write(dumps(data, json_format))
+
+
+def load(infile):
+    """
+    Load a JSON-file written in any of the formats, using orjson if installed.
+
+    :param infile: path to JSON-file
+    :return: deserialized object
+    """
+    if orjson is not None:
+        with open(infile, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(infile, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def loads(data):
+    """
+    Deserialize a JSON string or UTF-8 bytes, using orjson if installed.
+
+    :param data: str or bytes
+    :return: deserialized object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+class _ObjectStreamReader:
+    """Incrementally parse the members of a top level JSON object while tracking byte offsets."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0  # byte offset in the file of self.buf[self.pos]
+        self.eof = False
+
+    def fill(self):
+        """Drop consumed characters and read the next chunk."""
+        chunk = self.f.read(self.chunk_size)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+    def advance(self, new_pos):
+        self.offset += len(self.buf[self.pos:new_pos].encode("utf-8"))
+        self.pos = new_pos
+
+    def peek(self):
+        """Skip whitespace and return the next character, or '' at end of file."""
+        while True:
+            pos = self.pos
+            while pos < len(self.buf) and self.buf[pos] in " \t\n\r":
+                pos += 1
+            self.advance(pos)
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, chars, context):
+        char = self.peek()
+        if char not in chars or not char:
+            raise ValueError("Expected one of {!r} {}".format(chars, context))
+        self.advance(self.pos + 1)
+        return char
+
+    def decode(self):
+        """Decode the next JSON value and return it with its byte offset and length."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    start = self.offset
+                    self.advance(end)
+                    return value, start, self.offset - start
+            except ValueError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_record_spans(infile, chunk_size=65536):
+    """
+    Stream the members of a JSON-file holding one top level object, with their position in the file.
+
+    :param infile: path to JSON-file
+    :param chunk_size: number of characters to read at a time
+    :return: generator of (key, value, offset, length) tuples, offset and length of the value in bytes
+    """
+    # newline="" keeps "\r\n" untranslated, so the byte offsets also hold for CRLF files
+    with open(infile, encoding="utf-8", newline="") as f:
+        reader = _ObjectStreamReader(f, chunk_size)
+        reader.expect("{", "at start of {}".format(infile))
+        if reader.peek() == "}":
+            return
+
+        while True:
+            key, _, _ = reader.decode()
+            reader.expect(":", "after key {} in {}".format(key, infile))
+            value, offset, length = reader.decode()
+            yield key, value, offset, length
+
+            if reader.expect(",}", "after record {} in {}".format(key, infile)) == "}":
+                return
+
+
+def iter_records(infile, chunk_size=65536):
+    """
+    Stream the (key, value) pairs of a JSON-file holding one top level object.
+
+    Only one record at a time is held in memory, which keeps reading large
+    batch files memory-bounded. Works for all of the formats.
+
+    :param infile: path to JSON-file
+    :param chunk_size: number of characters to read at a time
+    :return: generator of (key, value) tuples
+    """
+    for key, value, _, _ in iter_record_spans(infile, chunk_size):
+        yield key, value
+
+
+def load_records(infile, spans):
+    """
+    Load single records from a JSON-file by their position, without parsing the rest of the file.
+
+    :param infile: path to JSON-file
+    :param spans: iterable of (key, offset, length) as found by iter_record_spans
+    :return: generator of (key, value) tuples
+    """
+    with open(infile, "rb") as f:
+        for key, offset, length in spans:
+            yield key, read_record(f, offset, length)
+
+
+def read_record(f, offset, length):
+    """
+    Read a single record from a JSON-file opened in binary mode, by its position.
+
+    :param f: file object opened with "rb"
+    :param offset: byte offset of the record as found by iter_record_spans
+    :param length: length of the record in bytes
+    :return: deserialized record
+    """
+    f.seek(offset)
+    return loads(f.read(length))
@@ -9,11 +9,10 @@ Output: JSON-file `cypern_metadata.json" containg dict in the current directory
 """
 import pandas as pd
 import argparse
-import json
 import os
-import datetime
 import batchupload
 import batchupload.helpers as helpers
+import json_serializer
 
 def strip(text):
     try:
@@ -88,23 +87,15 @@ def create_linked_filenamesmapping_file(metadata_dict):
     print("Successfully wrote file './SMVK-Cypern_filenames_mappings.csv'")
 
 
-def save_metadata_json_blob(metadata_dict, json_out):
+def save_metadata_json_blob(metadata_dict, json_out, json_format="pretty"):
     """Save json dictionary to file.
+    :json_format: one of json_serializer.JSON_FORMATS, defaults to "pretty" as the blob is checked in and read by humans
     :output fileobjet "./SMVK-Cypern_2017-01_metadata.json"
     """
-    outfile = open(json_out,"w")
-    outfile.write(json.dumps(metadata_dict, ensure_ascii=False, indent=4, cls=datetimeEncoder))
-    outfile.close()
+    json_serializer.save(metadata_dict, json_out, json_format)
 
     print("Successfully wrote file {}".format(json_out))
 
-class datetimeEncoder(json.JSONEncoder):
-     def default(self, obj):
-         if isinstance(obj, datetime.datetime):
-             return obj.isoformat()
-         # Let the base class default method raise the TypeError
-         return json.JSONEncoder.default(self, obj)
-
 
 def main(args):
     """Read infile and output json-file and filenames mapping file."""
@@ -121,7 +112,7 @@ def main(args):
         populated_dict = populate_new_dict_with_metadata(metadata, new_dict)
         #print("populated_dict: {}".format(populated_dict))
 
-        save_metadata_json_blob(populated_dict, args.json_out)
+        save_metadata_json_blob(populated_dict, args.json_out, args.json_format)
 
     except IOError as e:
         print("IOError: {}".format(e))
@@ -133,5 +124,6 @@ if __name__ == '__main__':
     parser.add_argument("--image_dir", default="/media/mos/My Passport/Wikimedia/Cypern")
     parser.add_argument("--fname_out", default="SMVK-Cypern_2017-01_filename_mappings.csv")
     parser.add_argument("--json_out", default="SMVK-Cypern_2017-01_metadata.json")
+    parser.add_argument("--json_format", choices=json_serializer.JSON_FORMATS, default="pretty")
     arguments = parser.parse_args()
     main(arguments)
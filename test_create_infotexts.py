@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the record selection in create_infotexts.
+
+create_infotexts needs pandas and batchupload, and reads people_mappings.json from the
+current directory when imported. The tests are skipped if the dependencies are missing.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+import json_serializer
+
+_cwd = os.getcwd()
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+try:
+    import create_infotexts
+except ImportError:
+    create_infotexts = None
+finally:
+    os.chdir(_cwd)
+
+
+def make_item(fotonr, depicted="", description="Grav 4, dromos. Marion.", place="Marion"):
+    return {"Fotonummer": fotonr, "Postnummer": 3924337, "Beskrivning": description,
+            "Personnamn / avbildad": depicted, "Ort, foto": place, "Nyckelord": "Svenska Cypernexpeditionen"}
+
+
+@unittest.skipUnless(create_infotexts, "pandas or batchupload not installed")
+class TestSelectMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.metadata_json = os.path.join(self.tmp_dir, "metadata.json")
+        self.metadata = {
+            "C01401": make_item("C01401"),
+            "C01402": make_item("C01402", depicted="Gjerstad, Einar, Sjöqvist"),
+            "C01403": make_item("C01403", description=""),
+            "C01746": make_item("C01746", depicted="Westholm"),
+            "15913D": make_item("15913D", depicted="Gjerstad, Einar, Lindros"),
+        }
+        json_serializer.save(self.metadata, self.metadata_json, "pretty")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def select(self, only=None, filters=None, limit=None):
+        return create_infotexts.load_selected_metadata(self.metadata_json, only, filters, limit)
+
+    def test_only_exact(self):
+        self.assertEqual(self.select(only=["C01746"]), {"C01746": self.metadata["C01746"]})
+
+    def test_only_glob(self):
+        self.assertEqual(list(self.select(only=["C014*"])), ["C01401", "C01402", "C01403"])
+
+    def test_only_exact_and_glob(self):
+        self.assertEqual(list(self.select(only=["C014*", "15913D"])), ["C01401", "C01402", "C01403", "15913D"])
+
+    def test_only_no_match(self):
+        self.assertEqual(self.select(only=["C9*"]), {})
+
+    def test_filter_faulty_depicted_people(self):
+        selected = self.select(filters=["faulty_depicted_people"])
+        self.assertEqual(list(selected), ["C01402", "C01746", "15913D"])
+
+    def test_filter_poor_description(self):
+        self.assertEqual(list(self.select(filters=["poor_description"])), ["C01403"])
+
+    def test_filters_combined_with_only(self):
+        selected = self.select(only=["C*"], filters=["faulty_depicted_people"])
+        self.assertEqual(list(selected), ["C01402", "C01746"])
+
+    def test_limit_with_filter(self):
+        selected = self.select(filters=["faulty_depicted_people"], limit=2)
+        self.assertEqual(list(selected), ["C01402", "C01746"])
+
+    def test_limit(self):
+        self.assertEqual(list(self.select(limit=1)), ["C01401"])
+        self.assertEqual(len(self.select(limit=100)), len(self.metadata))
+
+    def test_limit_zero(self):
+        self.assertEqual(self.select(limit=0), {})
+
+    def test_index_is_cached(self):
+        self.select()
+        index_file = self.metadata_json + ".index"
+        self.assertTrue(os.path.exists(index_file))
+        self.assertEqual(create_infotexts.load_metadata_index(self.metadata_json),
+                         json_serializer.load(index_file)["records"])
+
+    def test_index_rebuilt_when_size_changes(self):
+        self.select()
+        self.metadata["C05000"] = make_item("C05000")
+        json_serializer.save(self.metadata, self.metadata_json, "pretty")
+        self.assertEqual(self.select(only=["C05000"]), {"C05000": self.metadata["C05000"]})
+        self.assertEqual(self.select(only=["C01746"]), {"C01746": self.metadata["C01746"]})
+
+    def test_index_rebuilt_when_mtime_changes(self):
+        self.select()
+        stat = os.stat(self.metadata_json)
+        # Same size, but the records move: the stale offsets would read the wrong record
+        reordered = dict(reversed(list(self.metadata.items())))
+        json_serializer.save(reordered, self.metadata_json, "pretty")
+        os.utime(self.metadata_json, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(os.stat(self.metadata_json).st_size, stat.st_size)
+        self.assertEqual(self.select(only=["C01746"]), {"C01746": self.metadata["C01746"]})
+
+    def test_non_negative_int(self):
+        self.assertEqual(create_infotexts.non_negative_int("0"), 0)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            create_infotexts.non_negative_int("-600")
+
+
+if __name__ == '__main__':
+    unittest.main()
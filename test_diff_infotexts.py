@@ -0,0 +1,91 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for diff_infotexts."""
+import os
+import shutil
+import tempfile
+import unittest
+import diff_infotexts
+import json_serializer
+
+
+class TestDiffInfotexts(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.old = {
+            "C01746": {"filename": "Stora_profilväggen_-_SMVK-MM-Cypern_-_C01746",
+                       "info": "{{Photograph \n| depicted place     = Larnaca\n| date               = 1927\n}}\n",
+                       "cats": ["Kition", "Larnaca"],
+                       "meta_cats": ["Swedish Cyprus Expedition", "Media_contributed_by_SMVK_2017-02"]},
+            "C01138": {"filename": "Grav_4_-_SMVK-MM-Cypern_-_C01138",
+                       "info": "{{Photograph \n}}\n",
+                       "cats": ["Marion", "Tombs", "Archaeological_exhibitions"],
+                       "meta_cats": ["Swedish Cyprus Expedition"]},
+            "C02000": {"filename": "Removed_-_SMVK-MM-Cypern_-_C02000",
+                       "info": "", "cats": [], "meta_cats": []},
+        }
+        self.new = {
+            "C01746": {"filename": "Stora_profilväggen_inom_kultrummet_-_SMVK-MM-Cypern_-_C01746",
+                       "info": "{{Photograph \n| depicted place     = {{city|1=Q180918}}\n"
+                               "| date               = 1927\n}}\n",
+                       "cats": ["Larnaca", "Interiors_of_tombs"],
+                       "meta_cats": ["Media_contributed_by_SMVK_2017-02", "Swedish Cyprus Expedition"]},
+            "C01138": {"filename": "Grav_4_-_SMVK-MM-Cypern_-_C01138",
+                       "info": "{{Photograph \n}}\n",
+                       "cats": ["Archaeological_exhibitions", "Marion", "Tombs"],
+                       "meta_cats": ["Swedish Cyprus Expedition"]},
+            "C03000": {"filename": "Added_-_SMVK-MM-Cypern_-_C03000",
+                       "info": "", "cats": [], "meta_cats": []},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def diff(self, old_format="pretty", new_format="fast"):
+        old_file = os.path.join(self.tmp_dir, "old.json")
+        new_file = os.path.join(self.tmp_dir, "new.json")
+        json_serializer.save(self.old, old_file, old_format)
+        json_serializer.save(self.new, new_file, new_format)
+        return diff_infotexts.diff_infotexts(old_file, new_file)
+
+    def test_added_removed_changed(self):
+        report = self.diff()
+        self.assertEqual(report["added"], ["C03000"])
+        self.assertEqual(report["removed"], ["C02000"])
+        self.assertEqual(list(report["changed"]), ["C01746"])
+
+    def test_category_order_is_not_a_change(self):
+        report = self.diff()
+        self.assertNotIn("C01138", report["changed"])
+        self.assertNotIn("meta_cats", report["changed"]["C01746"])
+
+    def test_category_diff(self):
+        changes = self.diff()["changed"]["C01746"]
+        self.assertEqual(changes["cats"], {"added": ["Interiors_of_tombs"], "removed": ["Kition"]})
+
+    def test_info_diff(self):
+        changes = self.diff()["changed"]["C01746"]
+        self.assertEqual(changes["info"], ["@@ -2 +2 @@",
+                                           "-| depicted place     = Larnaca",
+                                           "+| depicted place     = {{city|1=Q180918}}"])
+
+    def test_filename_diff(self):
+        changes = self.diff()["changed"]["C01746"]
+        self.assertEqual(changes["filename"], {"old": self.old["C01746"]["filename"],
+                                               "new": self.new["C01746"]["filename"]})
+
+    def test_same_report_for_all_formats(self):
+        expected = self.diff("pretty", "fast")
+        for old_format in json_serializer.JSON_FORMATS:
+            for new_format in json_serializer.JSON_FORMATS:
+                self.assertEqual(self.diff(old_format, new_format), expected)
+
+    def test_identical_files(self):
+        self.new = self.old
+        self.assertEqual(self.diff(), {"added": [], "removed": [], "changed": {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
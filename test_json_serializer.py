@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for json_serializer."""
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import json_serializer
+
+
+class TestDumps(unittest.TestCase):
+
+    def setUp(self):
+        self.record = {
+            "Beskrivning": "Stora profilväggen inom kultrummet. Kition.",
+            "Ort, foto": "Lárnaka",
+            "Fotodatum": datetime.datetime(1929, 5, 17, 12, 30),
+            "Uppladdad": datetime.date(2017, 2, 1),
+            3924424: "C01746",
+            "Sökord": ["grav", "Ö"],
+        }
+
+    @unittest.skipUnless(json_serializer.orjson, "orjson not installed")
+    def test_fast_equals_compact(self):
+        self.assertEqual(json_serializer.dumps(self.record, "fast"),
+                         json_serializer.dumps(self.record, "compact"))
+
+    def test_datetime_as_iso_string(self):
+        for json_format in json_serializer.JSON_FORMATS:
+            output = json_serializer.loads(json_serializer.dumps(self.record, json_format))
+            self.assertEqual(output["Fotodatum"], "1929-05-17T12:30:00")
+            self.assertEqual(output["Uppladdad"], "2017-02-01")
+            self.assertEqual(output["3924424"], "C01746")
+
+    def test_non_ascii_not_escaped(self):
+        for json_format in json_serializer.JSON_FORMATS:
+            self.assertIn("profilväggen", json_serializer.dumps(self.record, json_format))
+
+    @unittest.skipUnless(json_serializer.orjson, "orjson not installed")
+    def test_fast_falls_back_for_big_int(self):
+        data = {"big": 2 ** 70}
+        with self.assertRaises(json_serializer.orjson.JSONEncodeError):
+            json_serializer.orjson.dumps(data)
+        self.assertEqual(json_serializer.dumps(data, "fast"), '{"big":1180591620717411303424}')
+        self.assertEqual(json_serializer.dumps(data, "fast"), json_serializer.dumps(data, "compact"))
+
+    def test_unserializable_raises_type_error(self):
+        for json_format in json_serializer.JSON_FORMATS:
+            with self.assertRaises(TypeError):
+                json_serializer.dumps({"a": object()}, json_format)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            json_serializer.dumps(self.record, "yaml")
+
+
+class TestRecordSpans(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = {
+            "C01746": {"Beskrivning": "Stora profilväggen inom kultrummet.", "Postnummer": 3924424},
+            "C01138": {"Beskrivning": "Grav 4, dromos. Marion.", "Nyckelord": ["a", "b"]},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_file(self, text):
+        path = os.path.join(self.tmp_dir, "data.json")
+        with open(path, "wb") as f:
+            f.write(text.encode("utf-8"))
+        return path
+
+    def assert_spans_round_trip(self, path):
+        spans = [(key, offset, length) for key, _, offset, length in json_serializer.iter_record_spans(path)]
+        self.assertEqual(dict(json_serializer.load_records(path, spans)), self.data)
+
+    def test_spans_round_trip_lf(self):
+        for json_format in json_serializer.JSON_FORMATS:
+            path = self.write_file(json_serializer.dumps(self.data, json_format))
+            self.assert_spans_round_trip(path)
+
+    def test_spans_round_trip_crlf(self):
+        text = json_serializer.dumps(self.data, "pretty").replace("\n", "\r\n")
+        path = self.write_file(text)
+        self.assert_spans_round_trip(path)
+
+    def test_spans_round_trip_small_chunks(self):
+        text = json_serializer.dumps(self.data, "pretty").replace("\n", "\r\n")
+        path = self.write_file(text)
+        spans = [(key, offset, length) for key, _, offset, length in json_serializer.iter_record_spans(path, 3)]
+        self.assertEqual(dict(json_serializer.load_records(path, spans)), self.data)
+
+    def test_save_writes_lf(self):
+        path = os.path.join(self.tmp_dir, "data.json")
+        json_serializer.save(self.data, path, "pretty")
+        with open(path, "rb") as f:
+            self.assertNotIn(b"\r\n", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()